@@ -2,17 +2,29 @@
 """
 Canvas API Tool Caller - Comprehensive bridge between Next.js and Canvas API tools
 """
+import asyncio
+import functools
+import hashlib
 import json
+import math
+import operator
+import sqlite3
 import sys
+import types
 import os
-import re
+import time
+import aiohttp
+import orjson
 import requests
+from bisect import bisect_right
 from datetime import datetime, timezone
+from typing import Any, Dict
 from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
 from canvasapi import Canvas
 from html.parser import HTMLParser
 from html import unescape
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
 from http.server import BaseHTTPRequestHandler   # Vercel provides this
 
 # Load environment variables
@@ -28,6 +40,24 @@ canvas = Canvas(API_URL, API_KEY)
 # Debug mode
 DEBUG = os.getenv("DEBUG", "False").lower() in ["true", "1", "yes"]
 
+# Shared HTTP session so raw REST calls reuse one TCP/TLS connection, with
+# pooling and retries on transient Canvas errors
+session = requests.Session()
+session.headers["Authorization"] = f"Bearer {API_KEY}"
+session.mount("https://", requests.adapters.HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=requests.adapters.Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+))
+
+# Response encoder bound once; orjson.dumps is a compiled C encoder shared by
+# the HTTP handler and the stdio worker
+_encode = orjson.dumps
+
 def debug_print(message):
     """
    Print debug information if DEBUG is enabled.
@@ -43,15 +73,604 @@ def handler(request: BaseHTTPRequestHandler) -> Dict[str, Any]:
     """Vercel entry-point – reads JSON body, returns JSON body."""
     length = int(request.headers.get("content-length", 0))
     body   = request.rfile.read(length) if length else b"{}"
-    result = handle_tool_call(json.loads(body or "{}"))
+    result = handle_tool_call(orjson.loads(body or b"{}"))
     return {
         "statusCode": 200,
         "headers":    {"Content-Type": "application/json"},
-        "body":       json.dumps(result)
+        "body":       _encode(result).decode()
     }
 
 # =============== HELPER FUNCTIONS ===============
 
+def _json(response):
+    """
+    Decode a requests response body with orjson.
+
+    Args:
+        response (requests.Response): The response to decode.
+
+    Returns:
+        The decoded JSON value.
+    """
+    return orjson.loads(response.content)
+
+# C-level field getters for the hot list-building loops
+_ID_NAME = operator.itemgetter('id', 'name')
+_ID_TITLE = operator.itemgetter('id', 'title')
+
+# Mountain-time zone used for user-facing due dates
+_MTN_ZONE = ZoneInfo("America/Denver")
+
+if sys.version_info >= (3, 11):
+    def _parse_canvas_dt(due_str):
+        """
+        Parse a Canvas 'YYYY-MM-DDTHH:MM:SSZ' timestamp.
+
+        Args:
+            due_str (str): The timestamp string from the Canvas API.
+
+        Returns:
+            datetime: The parsed timezone-aware datetime.
+        """
+        # fromisoformat accepts the trailing 'Z' directly on 3.11+
+        try:
+            return datetime.fromisoformat(due_str)
+        except ValueError:
+            return datetime.strptime(due_str, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+else:
+    def _parse_canvas_dt(due_str):
+        """
+        Parse a Canvas 'YYYY-MM-DDTHH:MM:SSZ' timestamp.
+
+        Args:
+            due_str (str): The timestamp string from the Canvas API.
+
+        Returns:
+            datetime: The parsed timezone-aware datetime.
+        """
+        try:
+            if due_str[-1] == 'Z':
+                return datetime.fromisoformat(due_str[:-1] + '+00:00')
+            return datetime.fromisoformat(due_str)
+        except ValueError:
+            return datetime.strptime(due_str, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+
+# The current user is stable for the lifetime of an API key, so it is cached
+# in memory per process and on disk across processes (24h TTL)
+_USER_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "canvas-pal")
+_USER_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# Metadata cache TTLs (seconds), tuned to how quickly each list changes
+_TTL_COURSES = 60 * 60
+_TTL_MODULES = 10 * 60
+_TTL_FILES = 10 * 60
+_TTL_ASSIGNMENT = 30 * 60
+_TTL_ANNOUNCEMENTS = 2 * 60
+_TTL_GRADES = 5 * 60
+
+_META_CACHE_PATH = os.path.join(_USER_CACHE_DIR, "meta.sqlite")
+
+@functools.lru_cache(maxsize=1)
+def _meta_cache():
+    """
+    Open (creating if needed) the on-disk metadata cache.
+
+    Returns:
+        sqlite3.Connection: The cache connection, or None if the cache
+            directory is unusable (e.g. a read-only filesystem).
+    """
+    try:
+        os.makedirs(_USER_CACHE_DIR, exist_ok=True)
+        conn = sqlite3.connect(_META_CACHE_PATH)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(endpoint TEXT PRIMARY KEY, fetched_at REAL, etag TEXT, body BLOB)"
+        )
+        conn.commit()
+        return conn
+    except (OSError, sqlite3.Error) as cache_error:
+        debug_print(f"Metadata cache unavailable: {str(cache_error)}")
+        return None
+
+def _cache_key(url, params):
+    """
+    Build a stable cache key for a URL and its query parameters.
+
+    Args:
+        url (str): The endpoint URL.
+        params (dict): Query parameters, or None.
+
+    Returns:
+        str: The cache key.
+    """
+    if not params:
+        return url
+    return url + "?" + urlencode(sorted(params.items()), doseq=True)
+
+def _cache_load(key):
+    """
+    Load a cached response row.
+
+    Args:
+        key (str): The cache key.
+
+    Returns:
+        tuple: (fetched_at, etag, body) or None if absent or unreadable.
+    """
+    conn = _meta_cache()
+    if conn is None:
+        return None
+    try:
+        return conn.execute(
+            "SELECT fetched_at, etag, body FROM responses WHERE endpoint = ?", (key,)
+        ).fetchone()
+    except sqlite3.Error as cache_error:
+        debug_print(f"Metadata cache read failed: {str(cache_error)}")
+        return None
+
+def _cache_store(key, etag, body):
+    """
+    Upsert a response row into the cache; failures are logged and ignored.
+
+    Args:
+        key (str): The cache key.
+        etag (str): The response ETag, or None.
+        body (bytes): The JSON response body.
+    """
+    conn = _meta_cache()
+    if conn is None:
+        return
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+            (key, time.time(), etag, body)
+        )
+        conn.commit()
+    except sqlite3.Error as cache_error:
+        debug_print(f"Metadata cache write failed: {str(cache_error)}")
+
+def _cached_get(url, ttl, params=None):
+    """
+    GET a slowly-changing Canvas endpoint through the on-disk cache.
+
+    Rows younger than the TTL are served with no network traffic; stale rows
+    are revalidated with If-None-Match when an ETag is stored, so unchanged
+    responses cost a 304 instead of a full body.
+
+    Args:
+        url (str): The endpoint URL.
+        ttl (int): Maximum row age in seconds before revalidation.
+        params (dict, optional): Query parameters.
+
+    Returns:
+        The decoded JSON response.
+
+    Raises:
+        requests.HTTPError: If the request fails.
+    """
+    key = _cache_key(url, params)
+    row = _cache_load(key)
+    if row and time.time() - row[0] < ttl:
+        debug_print(f"Metadata cache hit: {key}")
+        return orjson.loads(row[2])
+
+    headers = {"If-None-Match": row[1]} if row and row[1] else None
+    response = session.get(url, params=params, headers=headers)
+    if response.status_code == 304 and row:
+        debug_print(f"Metadata cache revalidated: {key}")
+        body = row[2]
+    else:
+        response.raise_for_status()
+        body = response.content
+    _cache_store(key, response.headers.get("ETag"), body)
+    return orjson.loads(body)
+
+def _user_id_cache_path():
+    """
+    Return the on-disk cache path for the current API key's user ID.
+
+    Returns:
+        str: The cache file path, keyed by a digest of the API key.
+    """
+    key_digest = hashlib.sha256(API_KEY.encode()).hexdigest()[:16] if API_KEY else "anonymous"
+    return os.path.join(_USER_CACHE_DIR, f"user_id-{key_digest}.json")
+
+@functools.lru_cache(maxsize=1)
+def _current_user():
+    """
+    Return the current Canvas user, fetched at most once per process.
+
+    Returns:
+        User: The canvasapi User object for the API key's owner.
+    """
+    debug_print("Fetching current user")
+    return canvas.get_current_user()
+
+@functools.lru_cache(maxsize=1)
+def _current_user_id():
+    """
+    Return the current user's ID, cached in memory and on disk.
+
+    Returns:
+        int: The Canvas user ID for the API key's owner.
+    """
+    cache_path = _user_id_cache_path()
+    try:
+        if time.time() - os.path.getmtime(cache_path) < _USER_CACHE_TTL:
+            with open(cache_path) as cache_file:
+                return json.load(cache_file)["user_id"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    user_id = _current_user().id
+    try:
+        os.makedirs(_USER_CACHE_DIR, exist_ok=True)
+        with open(cache_path, "w") as cache_file:
+            json.dump({"user_id": user_id}, cache_file)
+    except OSError as cache_error:
+        debug_print(f"Could not write user ID cache: {str(cache_error)}")
+    return user_id
+
+def _iter_paginated(url, params=None):
+    """
+    Stream the items of a paginated Canvas collection page by page.
+
+    Args:
+        url (str): The collection URL to fetch.
+        params (dict, optional): Query parameters for the first page.
+
+    Yields:
+        dict: Each item of each page, without materializing the full list.
+
+    Raises:
+        requests.HTTPError: If any page request fails.
+    """
+    while url:
+        response = session.get(url, params=params)
+        response.raise_for_status()
+        yield from _json(response)
+        # Follow the Link: rel="next" header for additional pages
+        url = response.links.get("next", {}).get("url")
+        params = None  # next links already carry the query string
+
+async def _fetch_pages(urls):
+    """
+    Fetch several already-known page URLs concurrently.
+
+    Args:
+        urls (list): The page URLs to fetch.
+
+    Returns:
+        list: The decoded JSON body of each page, in input order.
+    """
+    headers = {"Authorization": f"Bearer {API_KEY}"}
+    semaphore = asyncio.Semaphore(16)
+
+    async def fetch_one(session, url):
+        async with semaphore:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                return await response.json(loads=orjson.loads)
+
+    async with aiohttp.ClientSession(headers=headers) as session:
+        return await asyncio.gather(*[fetch_one(session, url) for url in urls])
+
+def _paginate_concurrent(url, params=None, ttl=None):
+    """
+    Fetch every page of a paginated Canvas collection, issuing pages beyond
+    the first concurrently when the Link header reveals the total page count.
+
+    Args:
+        url (str): The collection URL to fetch.
+        params (dict, optional): Query parameters for the first page.
+        ttl (int, optional): If given, serve and store the combined list
+            through the on-disk metadata cache with this max age in seconds.
+
+    Returns:
+        list: The items from all pages combined.
+
+    Raises:
+        requests.HTTPError: If the first or a sequential page request fails.
+    """
+    if ttl:
+        key = _cache_key(url, params)
+        row = _cache_load(key)
+        if row and time.time() - row[0] < ttl:
+            debug_print(f"Metadata cache hit: {key}")
+            return orjson.loads(row[2])
+        items = _fetch_all_pages(url, params)
+        _cache_store(key, None, orjson.dumps(items))
+        return items
+    return _fetch_all_pages(url, params)
+
+def _fetch_all_pages(url, params=None):
+    """
+    Fetch every page of a paginated collection without consulting the cache.
+
+    Args:
+        url (str): The collection URL to fetch.
+        params (dict, optional): Query parameters for the first page.
+
+    Returns:
+        list: The items from all pages combined.
+    """
+    response = session.get(url, params=params)
+    response.raise_for_status()
+    items = list(_json(response))
+
+    next_url = response.links.get("next", {}).get("url")
+    if not next_url:
+        return items
+
+    last_url = response.links.get("last", {}).get("url")
+    if last_url:
+        # Derive page URLs 2..N from the rel="last" template and fetch them
+        # all at once
+        split = urlsplit(last_url)
+        query = parse_qs(split.query)
+        try:
+            last_page = int(query.get("page", ["1"])[0])
+        except ValueError:
+            last_page = 0
+        if last_page > 1:
+            page_urls = []
+            for page in range(2, last_page + 1):
+                query["page"] = [str(page)]
+                page_urls.append(urlunsplit(split._replace(query=urlencode(query, doseq=True))))
+            for page_items in asyncio.run(_fetch_pages(page_urls)):
+                items.extend(page_items)
+            return items
+
+    # rel="last" absent or bookmark-based; walk rel="next" sequentially
+    while next_url:
+        response = session.get(next_url)
+        response.raise_for_status()
+        items.extend(_json(response))
+        next_url = response.links.get("next", {}).get("url")
+    return items
+
+@functools.lru_cache(maxsize=64)
+def _course(course_id):
+    """
+    Return a Course object, fetched at most once per course per process.
+
+    Args:
+        course_id (int): The ID of the course.
+
+    Returns:
+        Course: The canvasapi Course object.
+    """
+    debug_print(f"Fetching course {course_id}")
+    return canvas.get_course(course_id)
+
+def _invalidate_user_cache():
+    """Forget the cached user, e.g. after a 401 from a rotated API key."""
+    _current_user.cache_clear()
+    _current_user_id.cache_clear()
+    try:
+        os.remove(_user_id_cache_path())
+    except OSError:
+        pass
+
+async def _fetch_unsubmitted(session, semaphore, course_id):
+    """
+    Fetch all unsubmitted assignments for a course, following pagination.
+
+    Args:
+        session (aiohttp.ClientSession): The shared HTTP session.
+        semaphore (asyncio.Semaphore): Limits concurrent requests to Canvas.
+        course_id (int): The ID of the course.
+
+    Returns:
+        list: The raw assignment dictionaries returned by the Canvas API.
+    """
+    url = f"{API_URL}/api/v1/courses/{course_id}/assignments"
+    params = {"bucket": "unsubmitted", "include[]": "submission", "per_page": 100}
+    assignments = []
+    async with semaphore:
+        while url:
+            async with session.get(url, params=params) as response:
+                response.raise_for_status()
+                assignments.extend(await response.json(loads=orjson.loads))
+                # Follow the Link: rel="next" header for additional pages
+                next_link = response.links.get("next")
+                url = str(next_link["url"]) if next_link else None
+                params = None  # next links already carry the query string
+    return assignments
+
+async def _gather_unsubmitted(course_ids):
+    """
+    Fetch unsubmitted assignments for several courses concurrently.
+
+    Args:
+        course_ids (list): The course IDs to query.
+
+    Returns:
+        list: One list of assignment dictionaries per course, in input order.
+    """
+    semaphore = asyncio.Semaphore(16)
+    headers = {"Authorization": f"Bearer {API_KEY}"}
+    async with aiohttp.ClientSession(headers=headers) as session:
+        return await asyncio.gather(
+            *[_fetch_unsubmitted(session, semaphore, course_id) for course_id in course_ids]
+        )
+
+async def _fetch_submissions(course_id, user_id, assignment_ids):
+    """
+    Fetch the user's submissions for several assignments concurrently.
+
+    Args:
+        course_id (int): The ID of the course.
+        user_id (int): The ID of the user.
+        assignment_ids (list): The assignment IDs to fetch submissions for.
+
+    Returns:
+        list: One submission dictionary per assignment ID, in input order,
+            with None in place of any submission that failed to fetch.
+    """
+    headers = {"Authorization": f"Bearer {API_KEY}"}
+    connector = aiohttp.TCPConnector(limit=20)
+
+    async def fetch_one(session, assignment_id):
+        url = f"{API_URL}/api/v1/courses/{course_id}/assignments/{assignment_id}/submissions/{user_id}"
+        async with session.get(url) as response:
+            if response.status != 200:
+                debug_print(f"Error getting submission for assignment {assignment_id}: {response.status}")
+                return None
+            return await response.json(loads=orjson.loads)
+
+    async with aiohttp.ClientSession(headers=headers, connector=connector) as session:
+        return await asyncio.gather(
+            *[fetch_one(session, assignment_id) for assignment_id in assignment_ids]
+        )
+
+async def _fetch_course_grade_data(course_id):
+    """
+    Fetch the assignment groups, assignments, and submissions needed to
+    compute a course grade, with each level of the fan-out parallelized.
+
+    Args:
+        course_id (int): The ID of the course.
+
+    Returns:
+        list: Group dictionaries with their assignments and grades attached,
+            or a dict with an error message if a required fetch failed.
+    """
+    headers = {"Authorization": f"Bearer {API_KEY}"}
+    semaphore = asyncio.Semaphore(32)
+    user_id = _current_user_id()
+
+    async def fetch_json(session, url):
+        async with semaphore:
+            async with session.get(url) as response:
+                if response.status != 200:
+                    return response.status, None
+                return 200, await response.json(loads=orjson.loads)
+
+    async with aiohttp.ClientSession(headers=headers) as session:
+        # Stage 1: fetch the assignment groups
+        groups_status, groups = await fetch_json(
+            session, f"{API_URL}/api/v1/courses/{course_id}/assignment_groups"
+        )
+
+        if groups is None:
+            debug_print(f"Error getting assignment groups: {groups_status}")
+            return {"error": f"Error getting assignment groups: {groups_status}"}
+
+        # Stage 2: fetch the assignments of every group concurrently
+        assignment_responses = await asyncio.gather(*[
+            fetch_json(session, f"{API_URL}/api/v1/courses/{course_id}/assignment_groups/{group['id']}/assignments")
+            for group in groups
+        ])
+
+        # Stage 3: flatten to (group, assignment) pairs and fetch every
+        # submission concurrently
+        pairs = []
+        for group, (status, assignments) in zip(groups, assignment_responses):
+            if assignments is None:
+                debug_print(f"Error getting assignments for group {group['id']}: {status}")
+                continue
+            for assignment in assignments:
+                pairs.append((group["id"], assignment))
+
+        submission_responses = await asyncio.gather(*[
+            fetch_json(session, f"{API_URL}/api/v1/courses/{course_id}/assignments/{assignment['id']}/submissions/{user_id}")
+            for _, assignment in pairs
+        ])
+
+    # Reassemble the per-group structure the grade math expects
+    grades_by_group = {group["id"]: [] for group in groups}
+    for (group_id, assignment), (status, submission) in zip(pairs, submission_responses):
+        if submission is None:
+            debug_print(f"Error getting submission for assignment {assignment['id']}: {status}")
+            continue
+        grades_by_group[group_id].append({
+            "assignment_id": assignment["id"],
+            "assignment_name": assignment["name"],
+            "points_possible": assignment["points_possible"],
+            "grade": submission.get("grade"),
+            "score": submission.get("score")
+        })
+
+    return [{
+        "group_id": group["id"],
+        "group_name": group["name"],
+        "group_weight": group.get("group_weight"),
+        "assignments": grades_by_group[group["id"]]
+    } for group in groups]
+
+def _aggregate_groups(group_results, detailed=True):
+    """
+    Run the weighted-average arithmetic over fetched assignment groups.
+
+    This is the numeric core of get_course_grade, kept free of any I/O so
+    it is a single tight pass over in-memory data.
+
+    Args:
+        group_results (list): Group dictionaries with their assignments and
+            grades attached, as returned by _fetch_course_grade_data.
+        detailed (bool): When False, skip building the per-group breakdown
+            and return None in its place.
+
+    Returns:
+        tuple: (weighted_average, group_details) where weighted_average is
+            the course-wide weighted average in [0, 1] and group_details is
+            the per-group breakdown list, or None when detailed is False.
+    """
+    total_weight = 0
+    weighted_score_sum = 0
+    # Pre-sized so the loop assigns by index instead of growing the list
+    group_details = [None] * len(group_results) if detailed else None
+
+    for index, group in enumerate(group_results):
+        group_name = group.get('group_name')
+        weight = group.get('group_weight', 0) or 0
+        # Tuple default: no fresh empty-list allocation per iteration
+        assignments = group.get('assignments', ())
+
+        # Keep only graded assignments, then reduce with C-level sum()
+        # instead of branching and accumulating per row in the interpreter;
+        # the walrus captures make it one hash probe per field
+        graded = [(points, score) for a in assignments
+                  if (points := a.get('points_possible')) is not None
+                  and (score := a.get('score')) is not None]
+        graded_assignments = len(graded)
+        # fsum keeps the totals exactly rounded across long courses where
+        # repeated float += would accumulate error
+        total_points = math.fsum(points for points, _ in graded)
+        earned_points = math.fsum(score for _, score in graded)
+
+        if total_points > 0:
+            group_average = earned_points / total_points
+            group_percentage = group_average * 100
+            contribution = group_average * weight
+
+            # Only apply weight if the group is weighted and has graded work
+            if weight and graded_assignments > 0:
+                weighted_score_sum += contribution
+                total_weight += weight
+        else:
+            group_average = 0
+            group_percentage = 0
+            contribution = 0
+
+        if detailed:
+            group_details[index] = {
+                'name': group_name,
+                'weight': weight,
+                'average': group_average,
+                'percentage': group_percentage,
+                'contribution': contribution,
+                'graded_assignments': graded_assignments
+            }
+
+    if total_weight > 0:
+        weighted_average = weighted_score_sum / total_weight
+    else:
+        weighted_average = 0
+
+    return weighted_average, group_details
+
 def strip_html_tags(html_text):
     """
     Remove HTML tags from a string and clean up whitespace.
@@ -65,13 +684,38 @@ def strip_html_tags(html_text):
     if not html_text:
         return ""
 
-    # Unescape HTML entities
+    # Many Canvas messages are plain text; skip the tag scan entirely
+    if '<' not in html_text:
+        return ' '.join(unescape(html_text).split())
+
     text = unescape(html_text)
-    # Simple tag removal
-    text = re.sub(r'<[^>]+>', ' ', text)
-    # Clean up whitespace
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+
+    # Walk <...> pairs with str.find instead of a regex; linear even on
+    # pathological inputs with unterminated '<' characters
+    out = []
+    i = 0
+    while (lt := text.find('<', i)) != -1:
+        out.append(text[i:lt])
+        gt = text.find('>', lt + 1)
+        if gt == -1:
+            # Unterminated tag: keep the rest verbatim, as the regex did
+            i = lt
+            break
+        if gt == lt + 1:
+            # '<>' is not a tag; keep it, as the regex did
+            out.append('<>')
+        else:
+            out.append(' ')
+        i = gt + 1
+    out.append(text[i:])
+
+    # str.split/join collapses whitespace in C over the full buffer
+    return ' '.join(''.join(out).split())
+
+# Standard grading scale as a sorted cutoff table; a percentage at or above
+# _GRADE_CUTOFFS[i] earns at least _LETTER_GRADES[i + 1]
+_GRADE_CUTOFFS = (60, 63, 67, 70, 73, 77, 80, 83, 87, 90, 93)
+_LETTER_GRADES = ('F', 'D-', 'D', 'D+', 'C-', 'C', 'C+', 'B-', 'B', 'B+', 'A-', 'A')
 
 def determine_letter_grade(percentage):
     """
@@ -83,30 +727,11 @@ def determine_letter_grade(percentage):
     Returns:
         str: The corresponding letter grade.
     """
-    if percentage >= 93:
-        return "A"
-    elif percentage >= 90:
-        return "A-"
-    elif percentage >= 87:
-        return "B+"
-    elif percentage >= 83:
-        return "B"
-    elif percentage >= 80:
-        return "B-"
-    elif percentage >= 77:
-        return "C+"
-    elif percentage >= 73:
-        return "C"
-    elif percentage >= 70:
-        return "C-"
-    elif percentage >= 67:
-        return "D+"
-    elif percentage >= 63:
-        return "D"
-    elif percentage >= 60:
-        return "D-"
-    else:
-        return "F"
+    return _LETTER_GRADES[bisect_right(_GRADE_CUTOFFS, percentage)]
+
+# Memoized variant for callers that bucket the percentage first (e.g. to two
+# decimals), turning repeat conversions into a single hash hit
+_letter_grade_cached = functools.lru_cache(maxsize=1024)(determine_letter_grade)
 
 # =============== TOOL FUNCTIONS ===============
 
@@ -119,9 +744,12 @@ def get_courses():
     """
     debug_print("Running get_courses()")
     try:
-        user = canvas.get_current_user()
-        courses = user.get_favorite_courses()
-        result = [{"id": course.id, "name": course.name} for course in courses]
+        courses = _paginate_concurrent(
+            f"{API_URL}/api/v1/users/self/favorites/courses",
+            params={"per_page": 100},
+            ttl=_TTL_COURSES
+        )
+        result = [{"id": course["id"], "name": course["name"]} for course in courses]
         debug_print(f"Found {len(result)} courses")
         return result
     except Exception as e:
@@ -137,9 +765,12 @@ def get_all_courses():
     """
     debug_print("Running get_all_courses()")
     try:
-        user = canvas.get_current_user()
-        courses = user.get_courses(enrollment_state=['active'])
-        result = [{"id": course.id, "name": course.name, "code": getattr(course, 'course_code', 'N/A')}
+        courses = _paginate_concurrent(
+            f"{API_URL}/api/v1/users/self/courses",
+            params={"enrollment_state[]": "active", "per_page": 100},
+            ttl=_TTL_COURSES
+        )
+        result = [{"id": course["id"], "name": course["name"], "code": course.get('course_code', 'N/A')}
                   for course in courses]
         debug_print(f"Found {len(result)} active courses")
         return result
@@ -159,14 +790,19 @@ def get_assignments(course_id):
     """
     debug_print(f"Running get_assignments(course_id={course_id})")
     try:
-        course = canvas.get_course(course_id)
-        assignments = course.get_assignments()
-        result = [{"id": assignment.id,
-                   "name": assignment.name,
-                   "due_at": assignment.due_at,
-                   "points_possible": getattr(assignment, 'points_possible', 'N/A'),
-                   "html_url": getattr(assignment, 'html_url', 'N/A')}
-                  for assignment in assignments]
+        assignments = _paginate_concurrent(
+            f"{API_URL}/api/v1/courses/{course_id}/assignments",
+            params={"per_page": 100}
+        )
+        result = []
+        append = result.append
+        for assignment in assignments:
+            asg_id, name = _ID_NAME(assignment)
+            append({"id": asg_id,
+                    "name": name,
+                    "due_at": assignment.get("due_at"),
+                    "points_possible": assignment.get("points_possible", 'N/A'),
+                    "html_url": assignment.get("html_url", 'N/A')})
         debug_print(f"Found {len(result)} assignments")
         return result
     except Exception as e:
@@ -192,30 +828,29 @@ def get_assignment_details(course_id, assignment_id):
     """
     debug_print(f"Running get_assignment_details(course_id={course_id}, assignment_id={assignment_id})")
     try:
-        course = canvas.get_course(course_id)
-        assignment = course.get_assignment(assignment_id)
+        assignment = _cached_get(
+            f"{API_URL}/api/v1/courses/{course_id}/assignments/{assignment_id}",
+            ttl=_TTL_ASSIGNMENT
+        )
 
         # Get raw description
-        description = getattr(assignment, 'description', None)
+        description = assignment.get('description')
 
-        # Format the description
+        # Format the description; strip_html_tags short-circuits plain text
         if description:
-            if '<' not in description and '>' not in description:
-                formatted_description = description
-            else:
-                formatted_description = strip_html_tags(description)
+            formatted_description = strip_html_tags(description)
         else:
             formatted_description = "No description available for this assignment."
 
         result = {
-            "id": assignment.id,
-            "name": assignment.name,
+            "id": assignment["id"],
+            "name": assignment["name"],
             "description": formatted_description,
-            "due_at": getattr(assignment, 'due_at', 'No due date'),
-            "points_possible": getattr(assignment, 'points_possible', 'Not specified'),
-            "html_url": getattr(assignment, 'html_url', None)
+            "due_at": assignment.get('due_at', 'No due date'),
+            "points_possible": assignment.get('points_possible', 'Not specified'),
+            "html_url": assignment.get('html_url')
         }
-        debug_print(f"Retrieved assignment details for '{assignment.name}'")
+        debug_print(f"Retrieved assignment details for '{assignment['name']}'")
         return result
     except Exception as e:
         debug_print(f"Error in get_assignment_details: {str(e)}")
@@ -237,17 +872,22 @@ def get_announcements(course_id):
     """
     debug_print(f"Running get_announcements(course_id={course_id})")
     try:
-        course = canvas.get_course(course_id)
-        announcements = course.get_discussion_topics(only_announcements=True)
+        announcements = _paginate_concurrent(
+            f"{API_URL}/api/v1/courses/{course_id}/discussion_topics",
+            params={"only_announcements": "true", "per_page": 100},
+            ttl=_TTL_ANNOUNCEMENTS
+        )
         result = []
+        append = result.append
         for a in announcements:
-            message = getattr(a, 'message', '')
+            message = a.get('message', '')
             clean_message = strip_html_tags(message) if message else ''
-            result.append({
-                "id": a.id,
-                "title": a.title,
+            ann_id, title = _ID_TITLE(a)
+            append({
+                "id": ann_id,
+                "title": title,
                 "message": clean_message,
-                "posted_at": getattr(a, 'posted_at', 'Unknown')
+                "posted_at": a.get('posted_at', 'Unknown')
             })
         debug_print(f"Found {len(result)} announcements")
         return result
@@ -274,19 +914,22 @@ def get_submission(course_id, assignment_id):
     """
     debug_print(f"Running get_submission(course_id={course_id}, assignment_id={assignment_id})")
     try:
-        course = canvas.get_course(course_id)
-        assignment = course.get_assignment(assignment_id)
-        user = canvas.get_current_user()
-        submission = assignment.get_submission(user.id)
+        # The submissions/self endpoint returns the submission in one round
+        # trip; no course or assignment prefetch is needed
+        response = session.get(
+            f"{API_URL}/api/v1/courses/{course_id}/assignments/{assignment_id}/submissions/self"
+        )
+        response.raise_for_status()
+        submission = _json(response)
         result = {
-            "id": submission.id,
-            "score": submission.score,
-            "grade": submission.grade,
-            "submitted_at": submission.submitted_at,
-            "late": submission.late,
-            "missing": getattr(submission, 'missing', False)
+            "id": submission["id"],
+            "score": submission.get("score"),
+            "grade": submission.get("grade"),
+            "submitted_at": submission.get("submitted_at"),
+            "late": submission.get("late"),
+            "missing": submission.get("missing", False)
         }
-        debug_print(f"Retrieved submission data: score={submission.score}, grade={submission.grade}")
+        debug_print(f"Retrieved submission data: score={result['score']}, grade={result['grade']}")
         return result
     except Exception as e:
         debug_print(f"Error in get_submission: {str(e)}")
@@ -308,17 +951,10 @@ def get_course_files(course_id):
     """
     debug_print(f"Running get_course_files(course_id={course_id})")
     try:
-        headers = {
-            "Authorization": f"Bearer {API_KEY}"
-        }
-        file_list_url = f"{API_URL}/api/v1/courses/{course_id}/files"
-        file_response = requests.get(file_list_url, headers=headers)
-
-        if file_response.status_code != 200:
-            debug_print(f"API error: {file_response.status_code}")
-            return {"error": f"Failed to fetch files. Status: {file_response.status_code}"}
-
-        files = file_response.json()
+        files = _cached_get(
+            f"{API_URL}/api/v1/courses/{course_id}/files",
+            ttl=_TTL_FILES
+        )
         result = [{"id": file['id'],
                    "name": file['display_name'],
                    "url": file['url'],
@@ -345,19 +981,33 @@ def get_people_in_course(course_id):
     """
     debug_print(f"Running get_people_in_course(course_id={course_id})")
     try:
-        course = canvas.get_course(course_id)
-
-        students = list(course.get_users(enrollment_type=["student"]))
-        tas = list(course.get_users(enrollment_type=["ta"]))
-        professors = list(course.get_users(enrollment_type=["teacher"]))
+        # One paginated request covering all three roles instead of three
+        # separate enumerations; bucket users locally by enrollment type
+        users = _iter_paginated(
+            f"{API_URL}/api/v1/courses/{course_id}/users",
+            params={
+                "enrollment_type[]": ["student", "ta", "teacher"],
+                "include[]": "enrollments",
+                "per_page": 100
+            }
+        )
 
-        people = {
-            "students": [{"id": s.id, "name": s.name} for s in students],
-            "teaching_assistants": [{"id": ta.id, "name": ta.name} for ta in tas],
-            "professors": [{"id": p.id, "name": p.name} for p in professors]
+        role_buckets = {
+            "StudentEnrollment": "students",
+            "TaEnrollment": "teaching_assistants",
+            "TeacherEnrollment": "professors"
         }
+        people = {"students": [], "teaching_assistants": [], "professors": []}
+
+        for user in users:
+            buckets = {role_buckets.get(e.get("type")) for e in user.get("enrollments", [])}
+            for bucket in buckets:
+                if bucket:
+                    people[bucket].append({"id": user["id"], "name": user["name"]})
 
-        debug_print(f"Found {len(students)} students, {len(tas)} TAs, {len(professors)} professors")
+        debug_print(f"Found {len(people['students'])} students, "
+                    f"{len(people['teaching_assistants'])} TAs, "
+                    f"{len(people['professors'])} professors")
         return people
     except Exception as e:
         debug_print(f"Error in get_people_in_course: {str(e)}")
@@ -380,43 +1030,37 @@ def get_todo_list():
     """
     debug_print("Running get_todo_list()")
     try:
-        user = canvas.get_current_user()
+        user = _current_user()
         current_courses = user.get_favorite_courses()
 
-        mtn_zone = ZoneInfo("America/Denver")
         now = datetime.now(timezone.utc)
         due_list = []
 
-        for course in current_courses:
-            # Retrieve unsubmitted assignments for the course
-            assignments = course.get_assignments(
-                bucket='unsubmitted',
-                include=['submission']
-            )
+        # Fetch unsubmitted assignments for all courses concurrently rather
+        # than one blocking round-trip per course
+        courses = list(current_courses)
+        assignments_per_course = asyncio.run(
+            _gather_unsubmitted([course.id for course in courses])
+        )
 
+        for course, assignments in zip(courses, assignments_per_course):
             for asg in assignments:
-                due_str = getattr(asg, 'due_at', None)
+                due_str = asg.get('due_at')
                 if not due_str:
                     continue
 
-                try:
-                    # Parse the due date string into a datetime object
-                    if due_str.endswith('Z'):
-                        due_dt = datetime.fromisoformat(due_str.replace('Z', '+00:00'))
-                    else:
-                        due_dt = datetime.fromisoformat(due_str)
-                except ValueError:
-                    due_dt = datetime.strptime(due_str, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
-
-                due_dt_mtn = due_dt.astimezone(mtn_zone)
-                # Format for user display
-                due_str_formatted = due_dt_mtn.strftime("%Y-%m-%d %H:%M %Z")
+                due_dt = _parse_canvas_dt(due_str)
+                due_dt_mtn = due_dt.astimezone(_MTN_ZONE)
+                # Format for user display; f-string fields avoid re-parsing a
+                # strftime format table per assignment
+                due_str_formatted = (f"{due_dt_mtn.year:04d}-{due_dt_mtn.month:02d}-{due_dt_mtn.day:02d} "
+                                     f"{due_dt_mtn.hour:02d}:{due_dt_mtn.minute:02d} {due_dt_mtn.tzname()}")
 
-                delta = due_dt - now
-                days = delta.days
+                seconds = (due_dt - now).total_seconds()
+                days = int(seconds // 86400)
 
                 # Determine the status of the assignment based on the due date
-                if delta.total_seconds() < 0:
+                if seconds < 0:
                     status = "Overdue!"
                 elif days == 0:
                     status = "Today!"
@@ -429,16 +1073,16 @@ def get_todo_list():
                 due_list.append({
                     "course_name": course.name,
                     "course_id": course.id,
-                    "assignment_id": asg.id,
-                    "assignment_name": asg.name,
+                    "assignment_id": asg['id'],
+                    "assignment_name": asg['name'],
                     "due_at": due_str_formatted,
                     "days_until": days,
                     "status": status,
-                    "html_url": asg.html_url
+                    "html_url": asg.get('html_url')
                 })
 
         # Sort assignments by the number of days until they are due
-        due_list.sort(key=lambda x: x["days_until"])
+        due_list.sort(key=operator.itemgetter("days_until"))
         debug_print(f"Found {len(due_list)} unsubmitted assignments")
         return due_list
     except Exception as e:
@@ -465,7 +1109,7 @@ def get_unsubmitted_assignments(course_id):
     debug_print(f"Running get_unsubmitted_assignments(course_id={course_id})")
     try:
         # Retrieve the course object using the Canvas API
-        course = canvas.get_course(course_id)
+        course = _course(course_id)
         # Get unsubmitted assignments for the course
         assignments = course.get_assignments(bucket='unsubmitted', include=['submission'])
 
@@ -478,15 +1122,7 @@ def get_unsubmitted_assignments(course_id):
             if not due_str:
                 continue
 
-            try:
-                # Parse the due date string into a datetime object
-                if due_str.endswith('Z'):
-                    due_dt = datetime.fromisoformat(due_str.replace('Z', '+00:00'))
-                else:
-                    due_dt = datetime.fromisoformat(due_str)
-            except ValueError:
-                # Handle cases where the due date format is invalid
-                due_dt = datetime.strptime(due_str, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+            due_dt = _parse_canvas_dt(due_str)
 
             # Calculate the time difference between now and the due date
             delta = due_dt - now
@@ -513,7 +1149,7 @@ def get_unsubmitted_assignments(course_id):
             })
 
         # Sort the list of unsubmitted assignments by the number of days until they are due
-        due_list.sort(key=lambda x: x["days_until"])
+        due_list.sort(key=operator.itemgetter("days_until"))
         debug_print(f"Found {len(due_list)} unsubmitted assignments for course {course_id}")
         return due_list
     except Exception as e:
@@ -539,51 +1175,31 @@ def get_assignments_with_grades(course_id):
     """
     debug_print(f"Running get_assignments_with_grades(course_id={course_id})")
     try:
-        headers = {
-            "Authorization": f"Bearer {API_KEY}"
-        }
-
-        # Get the current user's ID
-        user_response = requests.get(
-            f"{API_URL}/api/v1/users/self",
-            headers=headers
-        )
-
-        if user_response.status_code != 200:
-            debug_print(f"Error getting user information: {user_response.status_code}")
-            return {"error": f"Error getting user information: {user_response.status_code}"}
-
-        user_id = user_response.json()["id"]
+        user_id = _current_user_id()
 
         # Get all assignments for the course
-        assignments_response = requests.get(
-            f"{API_URL}/api/v1/users/{user_id}/courses/{course_id}/assignments",
-            headers=headers
+        assignments_response = session.get(
+            f"{API_URL}/api/v1/users/{user_id}/courses/{course_id}/assignments"
         )
 
         if assignments_response.status_code != 200:
             debug_print(f"Error getting assignments: {assignments_response.status_code}")
             return {"error": f"Error getting assignments: {assignments_response.status_code}"}
 
-        assignments = assignments_response.json()
+        assignments = _json(assignments_response)
         assignment_results = []
 
-        # For each assignment, get the submission with grade
-        for assignment in assignments:
-            assignment_id = assignment["id"]
-            submission_response = requests.get(
-                f"{API_URL}/api/v1/courses/{course_id}/assignments/{assignment_id}/submissions/{user_id}",
-                headers=headers
-            )
-
-            if submission_response.status_code != 200:
-                debug_print(f"Error getting submission for assignment {assignment_id}: {submission_response.status_code}")
-                continue
+        # Fetch all submissions concurrently instead of one request per assignment
+        submissions = asyncio.run(_fetch_submissions(
+            course_id, user_id, [assignment["id"] for assignment in assignments]
+        ))
 
-            submission = submission_response.json()
+        for assignment, submission in zip(assignments, submissions):
+            if submission is None:
+                continue
 
             assignment_results.append({
-                "assignment_id": assignment_id,
+                "assignment_id": assignment["id"],
                 "assignment_name": assignment["name"],
                 "points_possible": assignment["points_possible"],
                 "grade": submission.get("grade"),
@@ -614,14 +1230,20 @@ def get_course_modules(course_id):
     """
     debug_print(f"Running get_course_modules(course_id={course_id})")
     try:
-        course = canvas.get_course(course_id)
-        modules = course.get_modules()
-        result = [{"id": module.id,
-                   "name": module.name,
-                   "position": getattr(module, 'position', 'N/A'),
-                   "published": getattr(module, 'published', None),
-                   "items_count": getattr(module, 'items_count', 0)}
-                  for module in modules]
+        modules = _paginate_concurrent(
+            f"{API_URL}/api/v1/courses/{course_id}/modules",
+            params={"per_page": 100},
+            ttl=_TTL_MODULES
+        )
+        result = []
+        append = result.append
+        for module in modules:
+            module_id, name = _ID_NAME(module)
+            append({"id": module_id,
+                    "name": name,
+                    "position": module.get('position', 'N/A'),
+                    "published": module.get('published'),
+                    "items_count": module.get('items_count', 0)})
         debug_print(f"Found {len(result)} modules")
         return result
     except Exception as e:
@@ -646,7 +1268,7 @@ def get_module_description(course_id, module_id):
     """
     debug_print(f"Running get_module_description(course_id={course_id}, module_id={module_id})")
     try:
-        course = canvas.get_course(course_id)
+        course = _course(course_id)
         module = course.get_module(module_id)
 
         result = {
@@ -659,26 +1281,31 @@ def get_module_description(course_id, module_id):
         # Try to get description directly from module
         description = getattr(module, 'description', None)
 
-        # If no direct description, try to infer from first module item
+        # If no direct description, try to infer from the first module item;
+        # per_page=1 avoids paginating through the whole module
         if not description:
             try:
-                items = list(module.get_module_items())
+                items_response = session.get(
+                    f"{API_URL}/api/v1/courses/{course_id}/modules/{module_id}/items",
+                    params={"per_page": 1}
+                )
+                items_response.raise_for_status()
+                items = _json(items_response)
                 if items:
                     first_item = items[0]
                     # Check for content in the first item (often used as description)
-                    if hasattr(first_item, 'content') and first_item.content:
-                        description = first_item.content
+                    if first_item.get('content'):
+                        description = first_item['content']
                     # If it's a header type item, the title might serve as a description
-                    elif hasattr(first_item, 'type') and first_item.type in ['SubHeader'] and hasattr(first_item, 'title'):
-                        description = first_item.title
+                    elif first_item.get('type') == 'SubHeader' and first_item.get('title'):
+                        description = first_item['title']
             except Exception as item_error:
                 debug_print(f"Error getting module items: {str(item_error)}")
 
+        # strip_html_tags short-circuits plain text with a single '<' scan,
+        # so no separate HTML sniff is needed here
         if description:
-            if '<' in description or '>' in description:
-                result["description"] = strip_html_tags(description)
-            else:
-                result["description"] = description
+            result["description"] = strip_html_tags(description)
         else:
             result["description"] = "No description available for this module."
 
@@ -688,12 +1315,14 @@ def get_module_description(course_id, module_id):
         debug_print(f"Error in get_module_description: {str(e)}")
         return {"error": str(e)}
 
-def get_course_grade(course_id):
+def get_course_grade(course_id, detailed=True):
     """
     Get overall grade for a course, including a breakdown by assignment groups.
 
     Args:
         course_id (int): The ID of the course.
+        detailed (bool): When False, omit the per-group breakdown and return
+            only the overall summary, skipping its allocation entirely.
 
     Returns:
         dict: A dictionary containing course grade details, including:
@@ -710,138 +1339,33 @@ def get_course_grade(course_id):
     """
     debug_print(f"Running get_course_grade(course_id={course_id})")
     try:
-        headers = {
-            "Authorization": f"Bearer {API_KEY}"
-        }
-
-        # Get the current user's ID
-        user_response = requests.get(
-            f"{API_URL}/api/v1/users/self",
-            headers=headers
-        )
-
-        if user_response.status_code != 200:
-            debug_print(f"Error getting user information: {user_response.status_code}")
-            return {"error": f"Error getting user information: {user_response.status_code}"}
-
-        user_id = user_response.json()["id"]
-
-        # Get all assignment groups for the course
-        groups_response = requests.get(
-            f"{API_URL}/api/v1/courses/{course_id}/assignment_groups",
-            headers=headers
-        )
-
-        if groups_response.status_code != 200:
-            debug_print(f"Error getting assignment groups: {groups_response.status_code}")
-            return {"error": f"Error getting assignment groups: {groups_response.status_code}"}
-
-        groups = groups_response.json()
-        group_results = []
-
-        for group in groups:
-            group_id = group["id"]
-
-            # Get assignments in this group
-            assignments_response = requests.get(
-                f"{API_URL}/api/v1/courses/{course_id}/assignment_groups/{group_id}/assignments",
-                headers=headers
-            )
-
-            if assignments_response.status_code != 200:
-                debug_print(f"Error getting assignments for group {group_id}: {assignments_response.status_code}")
-                continue
-
-            assignments = assignments_response.json()
-            assignment_grades = []
-
-            for assignment in assignments:
-                assignment_id = assignment["id"]
-
-                # Get the submission for this assignment
-                submission_response = requests.get(
-                    f"{API_URL}/api/v1/courses/{course_id}/assignments/{assignment_id}/submissions/{user_id}",
-                    headers=headers
-                )
-
-                if submission_response.status_code != 200:
-                    debug_print(f"Error getting submission for assignment {assignment_id}: {submission_response.status_code}")
-                    continue
-
-                submission = submission_response.json()
-
-                assignment_grades.append({
-                    "assignment_id": assignment_id,
-                    "assignment_name": assignment["name"],
-                    "points_possible": assignment["points_possible"],
-                    "grade": submission.get("grade"),
-                    "score": submission.get("score")
-                })
-
-            group_results.append({
-                "group_id": group_id,
-                "group_name": group["name"],
-                "group_weight": group.get("group_weight"),
-                "assignments": assignment_grades
-            })
-
-        # Calculate the weighted average
-        total_weight = 0
-        weighted_score_sum = 0
-        group_details = []
-
-        for group in group_results:
-            weight = group.get('group_weight', 0) or 0
-            assignments = group.get('assignments', [])
-            total_points = 0
-            earned_points = 0
-            graded_assignments = 0
-
-            for assignment in assignments:
-                points_possible = assignment.get('points_possible')
-                score = assignment.get('score')
-                # Only include assignments that have been graded
-                if points_possible is not None and score is not None:
-                    total_points += points_possible
-                    earned_points += score
-                    graded_assignments += 1
-
-            if total_points > 0:
-                group_average = earned_points / total_points
-                group_percentage = group_average * 100
-
-                # Only apply weight if the group has graded assignments
-                if graded_assignments > 0:
-                    weighted_score_sum += group_average * weight
-                    total_weight += weight
-            else:
-                group_average = 0
-                group_percentage = 0
-
-            group_details.append({
-                'name': group.get('group_name'),
-                'weight': weight,
-                'average': group_average,
-                'percentage': group_percentage,
-                'contribution': group_average * weight,
-                'graded_assignments': graded_assignments
-            })
-
-        if total_weight > 0:
-            weighted_average = weighted_score_sum / total_weight
-        else:
-            weighted_average = 0
-
+        # Serve recently computed grades straight from the on-disk cache,
+        # skipping the whole fetch and aggregation
+        cache_key = f"grade:{course_id}:{_current_user_id()}:{int(detailed)}"
+        row = _cache_load(cache_key)
+        if row and time.time() - row[0] < _TTL_GRADES:
+            debug_print(f"Grade cache hit for course {course_id}")
+            return orjson.loads(row[2])
+
+        # Fetch groups, assignments, and submissions with each level of the
+        # fan-out parallelized instead of one serial request per item
+        group_results = asyncio.run(_fetch_course_grade_data(course_id))
+        if isinstance(group_results, dict):
+            return group_results
+
+        weighted_average, group_details = _aggregate_groups(group_results, detailed)
         percentage = weighted_average * 100
-        letter_grade = determine_letter_grade(percentage)
+        letter_grade = _letter_grade_cached(round(percentage, 2))
 
         result = {
             'weighted_average': weighted_average,
             'weighted_percentage': percentage,
-            'letter_grade': letter_grade,
-            'group_details': group_details
+            'letter_grade': letter_grade
         }
+        if detailed:
+            result['group_details'] = group_details
 
+        _cache_store(cache_key, None, orjson.dumps(result))
         debug_print(f"Calculated course grade: {percentage:.2f}% ({letter_grade})")
         return result
     except Exception as e:
@@ -863,7 +1387,7 @@ def get_syllabus(course_id):
     """
     debug_print(f"Running get_syllabus(course_id={course_id})")
     try:
-        course = canvas.get_course(course_id)
+        course = _course(course_id)
         # CanvasAPI Course objects have a syllabus_body attribute
         html = getattr(course, 'syllabus_body', None)
         if html:
@@ -875,8 +1399,10 @@ def get_syllabus(course_id):
         debug_print(f"Error in get_syllabus: {str(e)}")
         return {"error": str(e)}
 
-# Map tool names to their corresponding functions
-TOOLS = {
+# Map tool names to their corresponding functions; read-only so nothing can
+# mutate the dispatch table after import, with interned keys so lookups with
+# an interned name hit on pointer equality
+TOOLS = types.MappingProxyType({sys.intern(name): func for name, func in {
     "get_courses": get_courses,  # Retrieve a list of favorite courses
     "get_all_courses": get_all_courses,  # Retrieve a list of all active courses
     "get_assignments": get_assignments,  # Retrieve a list of assignments for a course
@@ -892,7 +1418,7 @@ TOOLS = {
     "get_course_modules": get_course_modules,  # Retrieve a list of modules for a course
     "get_module_description": get_module_description,  # Retrieve details of a specific module
     "get_syllabus": get_syllabus,
-}
+}.items()})
 
 def handle_tool_call(request_json):
     """
@@ -904,49 +1430,78 @@ def handle_tool_call(request_json):
     Returns:
         dict: The result of the tool function execution, or an error message if the tool is unknown or fails.
     """
-    try:
-        # Extract tool name and parameters from the request
-        tool_name = request_json.get("tool")
-        params = request_json.get("params", {})
-
-        debug_print(f"Tool call request: tool={tool_name}, params={params}")
-
-        # Check if the tool name is valid
-        if tool_name not in TOOLS:
+    # Validate the expected failure modes with explicit checks that return
+    # early, keeping traceback construction off the error path
+    if not isinstance(request_json, dict):
+        return {"error": "Request must be a JSON object"}
+
+    tool_name = request_json.get("tool")
+    params = request_json.get("params", {})
+
+    if not isinstance(tool_name, str):
+        debug_print(f"Missing or invalid tool name: {tool_name!r}")
+        return {"error": "Missing tool name"}
+    if not isinstance(params, dict):
+        debug_print(f"Invalid params for {tool_name}: {params!r}")
+        return {"error": "params must be an object"}
+
+    # Intern the parser-allocated name so the comparisons and table lookup
+    # below resolve on pointer equality
+    tool_name = sys.intern(tool_name)
+
+    debug_print(f"Tool call request: tool={tool_name}, params={params}")
+
+    # Fast path for the tools that dominate traffic, skipping the table
+    # probe entirely
+    if tool_name == "get_course_grade":
+        tool_function = get_course_grade
+    elif tool_name == "get_assignments":
+        tool_function = get_assignments
+    elif tool_name == "get_assignments_with_grades":
+        tool_function = get_assignments_with_grades
+    else:
+        # Resolve the tool with a single dictionary lookup
+        tool_function = TOOLS.get(tool_name)
+        if tool_function is None:
             debug_print(f"Unknown tool: {tool_name}")
             return {"error": f"Unknown tool: {tool_name}"}
 
-        # Call the corresponding tool function with the provided parameters
-        tool_function = TOOLS[tool_name]
-        result = tool_function(**params)
-
-        return result
+    try:
+        return tool_function(**params)
+    except TypeError as e:
+        # Parameters that do not match the tool's signature
+        debug_print(f"Invalid parameters for {tool_name}: {str(e)}")
+        return {"error": f"Invalid parameters for {tool_name}: {str(e)}"}
     except Exception as e:
-        # Handle any exceptions that occur during tool execution and log the error
+        # Last-resort safety net for anything a tool lets escape
         debug_print(f"Error in handle_tool_call: {str(e)}")
         return {"error": f"Tool execution error: {str(e)}"}
 
 if __name__ == "__main__":
     """
-    Entry point for the script. Reads JSON input, processes the tool call, and outputs the result.
+    Entry point for the script. Serves line-delimited JSON tool calls from
+    stdin, writing one JSON response line per request, so a parent process
+    can pipeline many calls through a single long-lived worker.
     """
-    debug_print("Tool caller script started")
-    try:
-        # Read JSON input from stdin
-        input_data = sys.stdin.read()
-        debug_print(f"Received input: {input_data}")
-        request_json = json.loads(input_data)
-        # Process the tool call and get the result
-        result = handle_tool_call(request_json)
-        # Output the result as JSON
-        output = json.dumps(result)
-        print(output)
-        debug_print("Tool execution completed successfully")
-    except json.JSONDecodeError:
-        # Handle invalid JSON input
-        debug_print("Failed to parse JSON input")
-        print(json.dumps({"error": "Invalid JSON input"}))
-    except Exception as e:
-        # Handle unexpected errors
-        debug_print(f"Unexpected error: {str(e)}")
-        print(json.dumps({"error": f"Unexpected error: {str(e)}"}))
+    debug_print("Tool caller worker started")
+    write = sys.stdout.buffer.write
+    for line in sys.stdin.buffer:
+        if not line.strip():
+            continue
+        debug_print(f"Received input: {line}")
+        try:
+            request_json = orjson.loads(line)
+            # Process the tool call and emit the result as JSON bytes
+            write(_encode(handle_tool_call(request_json)))
+            debug_print("Tool execution completed successfully")
+        except orjson.JSONDecodeError:
+            # Handle invalid JSON input
+            debug_print("Failed to parse JSON input")
+            write(_encode({"error": "Invalid JSON input"}))
+        except Exception as e:
+            # Handle unexpected errors
+            debug_print(f"Unexpected error: {str(e)}")
+            write(_encode({"error": f"Unexpected error: {str(e)}"}))
+        write(b"\n")
+        sys.stdout.buffer.flush()
+    debug_print("stdin closed; worker exiting")